@@ -0,0 +1,171 @@
+# File: common.py — shared Google Sheets helpers for the RPS scrapers
+import logging
+import os
+import json
+import random
+import time
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+import gspread
+from google.oauth2.service_account import Credentials
+
+RPS_URL = "http://smart.dsmsoft.com/FMSSmartApp/Safex_RPS_Reports/RPS_Reports.aspx?usergroup=NRM.101"
+RPS_CACHE_PATH = "rps_cache.json"
+GOOGLE_SCOPE = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
+
+_gspread_client = None
+_spreadsheet_cache = {}
+_worksheet_cache = {}
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+# === Step 1: Load credentials from GitHub secret ===
+def load_google_credentials():
+    json_key = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
+    if not json_key:
+        raise Exception("GOOGLE_APPLICATION_CREDENTIALS secret not found in environment.")
+    return json.loads(json_key)
+
+def retry_gspread_request(func, *args, retries=5, delay=2, max_delay=30, total_budget_s=120, **kwargs):
+    start = time.monotonic()
+    for attempt in range(retries):
+        try:
+            return func(*args, **kwargs)
+        except gspread.exceptions.APIError as e:
+            status = e.response.status_code
+            if status not in {429, 500, 502, 503, 504} or attempt == retries - 1:
+                raise
+            if time.monotonic() - start > total_budget_s:
+                logging.warning("Retry budget of %ss exhausted; giving up.", total_budget_s)
+                raise
+            sleep_s = min(max_delay, delay * (1 + random.uniform(-0.5, 0.5)))
+            logging.warning("Sheets API returned %s; retrying in %.1fs...", status, sleep_s)
+            time.sleep(sleep_s)
+            delay = min(delay * 2, max_delay)
+
+def get_gspread_client():
+    global _gspread_client
+    if _gspread_client is None:
+        logging.info("Authorizing with Google Sheets...")
+        creds = Credentials.from_service_account_info(load_google_credentials(), scopes=GOOGLE_SCOPE)
+        _gspread_client = gspread.authorize(creds)
+    return _gspread_client
+
+def get_spreadsheet(sheet_id):
+    if sheet_id not in _spreadsheet_cache:
+        logging.info("Opening sheet...")
+        _spreadsheet_cache[sheet_id] = get_gspread_client().open_by_key(sheet_id)
+    return _spreadsheet_cache[sheet_id]
+
+def get_worksheet(sheet_id, tab_name):
+    key = (sheet_id, tab_name)
+    if key not in _worksheet_cache:
+        _worksheet_cache[key] = get_spreadsheet(sheet_id).worksheet(tab_name)
+    return _worksheet_cache[key]
+
+def fetch_existing_rps(sheet_id, tab_name):
+    spreadsheet = get_spreadsheet(sheet_id)
+    sheet = get_worksheet(sheet_id, tab_name)
+
+    modified_time = spreadsheet.get_lastUpdateTime()
+    cache = None
+    if os.path.exists(RPS_CACHE_PATH):
+        try:
+            with open(RPS_CACHE_PATH) as f:
+                cache = json.load(f)
+        except (ValueError, OSError):
+            cache = None
+    if (
+        cache
+        and cache.get("sheet_id") == sheet_id
+        and cache.get("tab") == tab_name
+        and cache.get("modified_time") == modified_time
+    ):
+        logging.info("Sheet unchanged since last run — using cached RPS Numbers.")
+        return sheet, cache["headers"], pd.Index(cache["rps"], dtype="string")
+
+    logging.info("Fetching existing RPS Numbers...")
+    sheet_headers = retry_gspread_request(sheet.row_values, 1)
+    rps_col_idx = sheet_headers.index("RPS No") + 1
+    rps_values = retry_gspread_request(sheet.col_values, rps_col_idx)[1:]
+    existing_rps = pd.Index(pd.Series(rps_values, dtype="string").str.strip())
+
+    with open(RPS_CACHE_PATH, "w") as f:
+        json.dump({
+            "sheet_id": sheet_id,
+            "tab": tab_name,
+            "modified_time": modified_time,
+            "headers": sheet_headers,
+            "rps": existing_rps.tolist(),
+        }, f)
+    return sheet, sheet_headers, existing_rps
+
+def push_excel_to_google_sheet(excel_path, sheet_id, tab_name, prefetched=None):
+    logging.info("Reading Excel...")
+    df = pd.read_excel(
+        excel_path,
+        engine="calamine",
+        dtype_backend="pyarrow",
+        dtype={"RPS Number": "string"},
+        parse_dates=["Dispatch Date", "Closure Date"],
+    )
+
+    sheet, sheet_headers, existing_rps = prefetched or fetch_existing_rps(sheet_id, tab_name)
+
+    logging.info("Filtering out duplicates and missing Closure Date...")
+    df_clean = df[df["Closure Date"].notna()]
+    new_data = df_clean[~df_clean["RPS Number"].isin(existing_rps)]
+
+    if new_data.empty:
+        logging.info("No new RPS records to add.")
+        return
+
+    # Filter rows with Dispatch Date within last 12 days
+    logging.info("Filtering rows older than 12 days based on Dispatch Date...")
+    date_cutoff = datetime.now() - timedelta(days=12)
+    new_data = new_data[new_data["Dispatch Date"] >= date_cutoff]
+
+    if new_data.empty:
+        logging.info("All new RPS rows are older than 12 days. Nothing to upload.")
+        return
+
+    column_mapping = {
+        "RPS Number": "RPS No",
+        "Vehicle Number": "Vehicle_Number",
+        "Dispatch Date": "Route_Start_Date_Time",
+        "Closure Date": "Route_Reaching_Date_Time",
+        "Route Name": "Route"
+    }
+
+    reverse_mapping = {v: k for k, v in column_mapping.items()}
+    ordered_columns = [reverse_mapping[h] for h in sheet_headers if h in reverse_mapping]
+
+    logging.info("Reordering and renaming columns...")
+    new_data = new_data[ordered_columns]
+    new_data.rename(columns=column_mapping, inplace=True)
+    num_cols = new_data.select_dtypes(include="number").columns
+    if len(num_cols):
+        # Compute finiteness before the cast: pyarrow numeric columns reject "" fills.
+        finite_mask = np.isfinite(new_data[num_cols].to_numpy(dtype="float64", na_value=np.nan))
+        new_data[num_cols] = new_data[num_cols].astype("string").where(finite_mask, "")
+    new_data = new_data.fillna("")
+
+    # Clean "Route" column
+    if "Route" in new_data.columns:
+        new_data["Route"] = new_data["Route"].str.replace(" ", "", regex=False)
+
+    logging.info("Sorting by Closure Date...")
+    new_data = new_data.sort_values("Route_Reaching_Date_Time")
+    for date_col in ("Route_Start_Date_Time", "Route_Reaching_Date_Time"):
+        new_data[date_col] = new_data[date_col].dt.strftime("%Y-%m-%d %H:%M:%S")
+
+    logging.info("Uploading to Google Sheet...")
+    retry_gspread_request(
+        sheet.append_rows,
+        new_data.to_numpy(dtype=str, na_value="").tolist(),
+        value_input_option="RAW",
+        insert_data_option="INSERT_ROWS",
+        table_range="A1",
+    )
+    logging.info("%d new rows added.", len(new_data))
@@ -0,0 +1,2 @@
+# Download strategies for the RPS report. Each module exposes
+# download() -> str (path to the downloaded Excel file).
@@ -0,0 +1,82 @@
+# File: scrapers/excel.py — browser-driven Excel download via Playwright
+import logging
+import os
+from datetime import datetime, timedelta
+
+from playwright.sync_api import sync_playwright
+
+from common import RPS_URL
+
+CHROMIUM_ARGS = [
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    "--disable-sync",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-first-run",
+]
+
+def download():
+    logging.info("Starting RPS extraction via Excel download...")
+    download_dir = os.path.abspath("downloads")
+    os.makedirs(download_dir, exist_ok=True)
+
+    with sync_playwright() as p:
+        cdp_endpoint = os.environ.get("RPS_CDP_ENDPOINT")
+        if cdp_endpoint:
+            logging.info("Connecting to existing browser at %s...", cdp_endpoint)
+            browser = p.chromium.connect_over_cdp(cdp_endpoint)
+            context = browser.new_context(accept_downloads=True)
+        else:
+            context = p.chromium.launch_persistent_context(
+                user_data_dir=".pw-profile",
+                headless=True,
+                accept_downloads=True,
+                args=CHROMIUM_ARGS,
+            )
+        blocked_types = {"image", "font", "stylesheet", "media", "beacon"}
+        context.route(
+            "**/*",
+            lambda route: route.abort() if route.request.resource_type in blocked_types else route.continue_(),
+        )
+        page = context.pages[0] if context.pages else context.new_page()
+
+        logging.info("Navigating to RPS page...")
+        page.goto(RPS_URL, wait_until="commit")
+        page.wait_for_selector("#ctl00_ContentPlaceHolder1_dtFrom")
+
+        logging.info("Selecting all vehicles...")
+        vehicle_checkboxes = (
+            'xpath=/html/body/form/div[5]/div/div/div/div/div/div/div[3]/div/div[4]'
+            '//ul/li/input[@type="checkbox"]'
+        )
+        page.wait_for_selector(vehicle_checkboxes, state="attached")
+        page.eval_on_selector_all(
+            vehicle_checkboxes,
+            "els => els.forEach(e => { e.checked = true; e.dispatchEvent(new Event('change', {bubbles: true})); })",
+        )
+
+        logging.info("Picking date range (last 15 days)...")
+        from_date = (datetime.now() - timedelta(days=15)).strftime("%d-%m-%Y")
+        page.locator("#ctl00_ContentPlaceHolder1_dtFrom").fill(from_date)
+
+        logging.info("Clicking Submit...")
+        page.locator("#ctl00_ContentPlaceHolder1_btnSubmit").click()
+        page.wait_for_load_state("networkidle")
+
+        logging.info("Clicking download button...")
+        with page.expect_download() as download_info:
+            page.locator('xpath=/html/body/form/div[5]/div/div/div/div/div/div/div[4]/div/table/div/div[4]/div/div/div[3]/div[1]/div/div/div').click()
+        dl = download_info.value
+        downloaded_file_path = os.path.join(download_dir, dl.suggested_filename)
+        dl.save_as(downloaded_file_path)
+        logging.info("Excel downloaded to: %s", downloaded_file_path)
+
+        context.close()
+        return downloaded_file_path
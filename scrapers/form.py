@@ -0,0 +1,53 @@
+# File: scrapers/form.py — direct HTTP form-post download (no browser)
+import logging
+import os
+from datetime import datetime, timedelta
+
+import requests
+from lxml import html as lxml_html
+
+from common import RPS_URL
+
+def download():
+    logging.info("Trying direct HTTP download (no browser)...")
+    download_dir = os.path.abspath("downloads")
+    os.makedirs(download_dir, exist_ok=True)
+
+    session = requests.Session()
+    resp = session.get(RPS_URL, timeout=60)
+    resp.raise_for_status()
+    tree = lxml_html.fromstring(resp.text)
+
+    def hidden_field(name):
+        values = tree.xpath(f'//input[@name="{name}"]/@value')
+        return values[0] if values else ""
+
+    viewstate = hidden_field("__VIEWSTATE")
+    if not viewstate:
+        raise Exception("No __VIEWSTATE field in the RPS page — cannot post the form directly.")
+
+    from_date = (datetime.now() - timedelta(days=15)).strftime("%d-%m-%Y")
+    to_date = datetime.now().strftime("%d-%m-%Y")
+
+    logging.info("Posting report form...")
+    form_data = {
+        "__VIEWSTATE": viewstate,
+        "__VIEWSTATEGENERATOR": hidden_field("__VIEWSTATEGENERATOR"),
+        "__EVENTVALIDATION": hidden_field("__EVENTVALIDATION"),
+        "ctl00$ContentPlaceHolder1$dtFrom": from_date,
+        "ctl00$ContentPlaceHolder1$dtTo": to_date,
+        "ctl00$ContentPlaceHolder1$ddlVehicle": "ALL",
+        "ctl00$ContentPlaceHolder1$btnSubmit": "Submit",
+    }
+    resp = session.post(RPS_URL, data=form_data, timeout=120)
+    resp.raise_for_status()
+
+    content_type = resp.headers.get("Content-Type", "")
+    if "spreadsheet" not in content_type and "excel" not in content_type:
+        raise Exception(f"Server did not return an Excel export (Content-Type: {content_type}).")
+
+    downloaded_file_path = os.path.join(download_dir, "RPS_Report.xlsx")
+    with open(downloaded_file_path, "wb") as f:
+        f.write(resp.content)
+    logging.info("Excel downloaded to: %s", downloaded_file_path)
+    return downloaded_file_path